@@ -1,7 +1,13 @@
+import json
 from typing import NamedTuple
 
 from pygments.token import _TokenType
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 HTTP_METHODS = ['get', 'post', 'put', 'delete', 'head']
 AUTO_SAVE_NAME = '__auto__'
 DEFAULT_SAVE_NAME = '__default__'
@@ -14,3 +20,16 @@ class AlwaysNoneNameSpace:
 
 PeekToken = NamedTuple('PeekToken', [('index', int), ('ttype', _TokenType), ('value', str)])
 NONE_NS = AlwaysNoneNameSpace()
+
+
+def json_loads(s):
+    """
+    Decode JSON with orjson when it is installed. Documents that orjson rejects but the json
+    module accepts, e.g. NaN or integers beyond 64 bits, are decoded by the json module.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(s)
@@ -1,7 +1,9 @@
+import bisect
+import functools
 import itertools
 import logging
 import os
-from typing import Iterable, List, Optional
+from typing import Iterable, List, Optional, Tuple
 
 from prompt_toolkit.completion import Completer, CompleteEvent, Completion, WordCompleter, FuzzyCompleter, PathCompleter
 from prompt_toolkit.contrib.completers import SystemCompleter
@@ -12,8 +14,8 @@ from peek.common import PeekToken, HTTP_METHODS
 from peek.completions import PayloadKeyCompletion
 from peek.config import config_location
 from peek.lexers import (
-    PeekLexer,
-    UrlPathLexer,
+    PEEK_LEXER,
+    URL_PATH_LEXER,
     PathPart,
     ParamName,
     Ampersand,
@@ -47,16 +49,26 @@ _DICT_EVENT_TYPES = (
 )
 
 
+@functools.lru_cache(maxsize=128)
+def _func_option_name_completer(option_names: Tuple[str, ...]) -> WordCompleter:
+    """
+    Option names of a function rarely change, so the completer is built once per distinct set of names
+    """
+    return WordCompleter(sorted([n if n.startswith('@') else (n + '=') for n in option_names]), WORD=True)
+
+
 class ParserStateTracker:
     def __init__(self, text: str):
         self.text = text
         self._events: List[ParserEvent] = []
         self._tokens: List[PeekToken] = []
+        self._token_indices: List[int] = []
         self._payload_events: List[ParserEvent] = []
 
     def __call__(self, event: ParserEvent):
         if event.type is ParserEventType.AFTER_TOKEN:
             self._tokens.append(event.token)
+            self._token_indices.append(event.token.index)
         elif event.type in _DICT_EVENT_TYPES:
             if self.last_event.type is ParserEventType.BEFORE_ES_PAYLOAD_INLINE:
                 self._payload_events.append(event)
@@ -79,6 +91,16 @@ class ParserStateTracker:
     def payload_events(self):
         return self._payload_events
 
+    def position_of_token(self, token: PeekToken) -> int:
+        """
+        Find the position of the given token in the tokens list. Tokens are published
+        in the order of their char index, so the position is found with a binary search.
+        """
+        i = bisect.bisect_left(self._token_indices, token.index)
+        if i < len(self._tokens) and self._tokens[i] == token:
+            return i
+        return self._tokens.index(token)
+
     @property
     def stmt_token(self) -> Optional[PeekToken]:
         if not self._events:
@@ -141,8 +163,8 @@ class ParserStateTracker:
 class PeekCompleter(Completer):
     def __init__(self, app):
         self.app = app
-        self.lexer = PeekLexer()
-        self.url_path_lexer = UrlPathLexer()
+        self.lexer = PEEK_LEXER
+        self.url_path_lexer = URL_PATH_LEXER
         self.api_completer = self.init_api_completer()
 
     def init_api_completer(self):
@@ -308,8 +330,7 @@ class PeekCompleter(Completer):
         func = self.app.vm.functions.get(stmt_token.value)
         if func is None or not getattr(func, 'options', None):
             return []
-        options = sorted([n if n.startswith('@') else (n + '=') for n in func.options.keys()])
-        return WordCompleter(options, WORD=True).get_completions(document, complete_event)
+        return _func_option_name_completer(tuple(func.options.keys())).get_completions(document, complete_event)
 
     def _maybe_complete_special_for_run_func_file_path(
         self, document: Document, complete_event: CompleteEvent, state_tracker: ParserStateTracker
@@ -364,7 +385,7 @@ class PeekCompleter(Completer):
         method_token, path_token = tokens[0], tokens[1]
         path_tokens = list(self.url_path_lexer.get_tokens_unprocessed(path_token.value))
         last_event = state_tracker.last_event
-        payload_tokens = tokens[tokens.index(last_event.token) :]
+        payload_tokens = tokens[state_tracker.position_of_token(last_event.token) :]
         candidates, rules = self.api_completer.complete_payload(
             document,
             complete_event,
@@ -397,7 +418,7 @@ class PeekCompleter(Completer):
             complete_event,
             method_token.value.upper(),
             path_tokens,
-            tokens[tokens.index(last_event.token) :],
+            tokens[state_tracker.position_of_token(last_event.token) :],
             state_tracker.payload_events,
         )
         if not candidates:
@@ -407,8 +428,13 @@ class PeekCompleter(Completer):
 
 
 class ConstantCompleter(Completer):
-    def __init__(self, candidates):
+    """
+    Completer that yields the given candidates. The candidates can be a one-shot iterable,
+    e.g. a generator, since FuzzyCompleter consumes the wrapped completer once per call.
+    """
+
+    def __init__(self, candidates: Iterable[Completion]):
         self.candidates = candidates
 
     def get_completions(self, document: Document, complete_event: CompleteEvent) -> Iterable[Completion]:
-        return self.candidates
+        yield from self.candidates
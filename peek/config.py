@@ -1,3 +1,5 @@
+import copy
+import functools
 import logging
 import os
 import platform
@@ -25,8 +27,18 @@ def ensure_dir_exists(path):
     os.makedirs(parent_dir, exist_ok=True)
 
 
+@functools.lru_cache(maxsize=None)
+def _parse_package_config(package_config_file: str) -> dict:
+    """
+    Parse the config file shipped with the package. It does not change while the process
+    is running, so it is parsed once and returned as a plain nested dict.
+    """
+    return ConfigObj(package_config_file).dict()
+
+
 def load_config(package_config_file: str, config_file: str = None, extra_config_options: Iterable[str] = None):
-    config = ConfigObj(package_config_file)
+    # Copy so that the cached package config is never mutated
+    config = ConfigObj(copy.deepcopy(_parse_package_config(package_config_file)))
     if config_file is not None:
         config.merge(ConfigObj(config_file))
 
@@ -53,7 +65,7 @@ def load_config(package_config_file: str, config_file: str = None, extra_config_
             if isinstance(parent, dict):
                 parent[key_components[-1]] = value
 
-        config.merge(ConfigObj(extra_config))
+        config.merge(extra_config)
 
     return config
 
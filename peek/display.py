@@ -1,5 +1,6 @@
 import json
 import logging
+import re
 import sys
 from json import JSONDecodeError
 from typing import Any
@@ -14,15 +15,22 @@ from prompt_toolkit.styles import (
 )
 from pygments.token import Token
 
-from peek.lexers import PeekStyle, PeekLexer, Heading, TipsMinor
+from peek.common import json_loads
+from peek.lexers import PeekStyle, PEEK_VALUE_LEXER, Heading, TipsMinor
 
 _logger = logging.getLogger(__name__)
 
+# Possible first chars of a JSON document, including NaN and Infinity that the json module accepts
+_JSON_FIRST_CHARS = frozenset('{["-0123456789tfnNI')
+_FIRST_NON_WHITE_PATTERN = re.compile(r'\S')
+# Syntax highlighting dominates the display time of large payloads, skip it if they are not pretty printed
+_MAX_HIGHLIGHT_SIZE = 1024 * 1024
+
 
 class Display:
     def __init__(self, app):
         self.app = app
-        self.payload_lexer = PeekLexer(stack=('value',))
+        self.payload_lexer = PEEK_VALUE_LEXER
         self.style = style_from_pygments_cls(PeekStyle)
         self.style_transformation = ConditionalStyleTransformation(
             SwapLightAndDarkStyleTransformation(), self.app.config.as_bool('swap_colour')
@@ -35,34 +43,32 @@ class Display:
     def info(self, source, header_text=''):
         if source is None:
             return
+        header, plain_header = None, None
         if not self.app.batch_mode:
-            self._tee_print(
-                FormattedText([(PeekStyle.styles[Heading], '=== '), (PeekStyle.styles[TipsMinor], header_text)]),
-                plain_source=f'=== {header_text}',
-            )
+            header = FormattedText([(PeekStyle.styles[Heading], '=== '), (PeekStyle.styles[TipsMinor], header_text)])
+            plain_header = f'=== {header_text}'
         if isinstance(source, FormattedText):
-            self._tee_print(source)
+            self._tee_print(source, header=header, plain_header=plain_header)
         else:
             source, plain_source = self._try_jsonify(source)  # TODO: try more types
-            self._tee_print(source, plain_source=plain_source)
+            self._tee_print(source, plain_source=plain_source, header=header, plain_header=plain_header)
 
     def error(self, source, header_text=''):
         if source is None:
             return
+        header, plain_header = None, None
         if not self.app.batch_mode:
-            self._tee_print(
-                merge_formatted_text(
-                    [
-                        HTML('<ansired>--- </ansired>').formatted_text,
-                        FormattedText([(PeekStyle.styles[TipsMinor], header_text)]),
-                    ]
-                ),
-                plain_source=f'--- {header_text}',
+            header = merge_formatted_text(
+                [
+                    HTML('<ansired>--- </ansired>').formatted_text,
+                    FormattedText([(PeekStyle.styles[TipsMinor], header_text)]),
+                ]
             )
+            plain_header = f'--- {header_text}'
         if isinstance(source, FormattedText):
-            self._tee_print(source)
+            self._tee_print(source, header=header, plain_header=plain_header)
         else:
-            self._tee_print(source, plain_source=source)
+            self._tee_print(source, plain_source=source, header=header, plain_header=plain_header)
 
     def warn(self, source):
         if source is None:
@@ -80,18 +86,24 @@ class Display:
             )
 
     def _try_jsonify(self, source):
-        # If it is a string, first check whether it can be decoded as JSON
+        # If it is a string, first check whether it can be decoded as JSON.
+        # Strings that cannot start a JSON value skip the decoder and its exception.
         if isinstance(source, str):
-            try:
-                source = json.loads(source)
-            except JSONDecodeError:
-                _logger.debug(f'Source string is not JSON: {source!r}')
+            m = _FIRST_NON_WHITE_PATTERN.search(source)
+            if m is not None and m.group() in _JSON_FIRST_CHARS:
+                try:
+                    source = json_loads(source)
+                except JSONDecodeError:
+                    _logger.debug(f'Source string is not JSON: {source!r}')
 
         try:
             if not isinstance(source, str):
                 source = json.dumps(source, cls=PeekEncoder, app=self.app, indent=2 if self.pretty_print else None)
+            if not self.pretty_print and len(source) > _MAX_HIGHLIGHT_SIZE:
+                _logger.debug(f'Skip highlighting for source of size {len(source)}')
+                return source, source
             tokens = []
-            for t in pygments.lex(source, lexer=self.payload_lexer):
+            for t in merge_adjacent_tokens(pygments.lex(source, lexer=self.payload_lexer)):
                 tokens.append(t)
                 if t[0] is Token.Error:
                     _logger.debug(f'Source string is not valid payload type: {t!r}')
@@ -101,16 +113,28 @@ class Display:
             _logger.debug(f'Cannot render object as json: {source!r}, {e}')
             return source, source
 
-    def _tee_print(self, source, plain_source=None):
+    def _tee_print(self, source, plain_source=None, header=None, plain_header=None):
+        """
+        Print the source, preceded by the header line if given. The header and source are
+        printed with a single call so that the output is written and flushed only once.
+        """
         content = None
         if self.app.batch_mode and not sys.stdout.isatty():
             content = all_to_text(source) if plain_source is None else plain_source
+            if header is not None:
+                print(plain_header, file=sys.stdout)
             print(content, file=sys.stdout, end='')
+        elif header is not None:
+            print_formatted_text(
+                header, source, sep='\n', style=self.style, style_transformation=self.style_transformation
+            )
         else:
             print_formatted_text(source, style=self.style, style_transformation=self.style_transformation)
 
         if self.app.capture.file() is not None:
             content = content or (all_to_text(source) if plain_source is None else plain_source)
+            if header is not None:
+                print(plain_header, file=self.app.capture.file())
             print(content, file=self.app.capture.file())
 
 
@@ -128,6 +152,23 @@ class PeekEncoder(json.JSONEncoder):
         return str(o)
 
 
+def merge_adjacent_tokens(tokens):
+    """
+    Merge consecutive tokens of the same type into one, e.g. the quotes and content of
+    a string. The rendering is the same while much fewer tokens are kept for large payloads.
+    """
+    ttype, values = None, []
+    for t in tokens:
+        if t[0] is ttype:
+            values.append(t[1])
+        else:
+            if values:
+                yield ttype, ''.join(values)
+            ttype, values = t[0], [t[1]]
+    if values:
+        yield ttype, ''.join(values)
+
+
 def all_to_text(*args):
     fragments = []
     for v in args:
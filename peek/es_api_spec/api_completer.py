@@ -1,14 +1,15 @@
 import ast
+import functools
 import json
 import logging
 from abc import ABCMeta
-from typing import List, Tuple
+from typing import Iterable, List, Tuple
 
 from prompt_toolkit.completion import Completion, CompleteEvent
 from prompt_toolkit.document import Document
 from pygments.token import String, Name
 
-from peek.common import PeekToken
+from peek.common import PeekToken, json_loads
 from peek.es_api_spec.schema import Schema
 from peek.lexers import Slash, PathPart, Assign, CurlyLeft, CurlyRight, DictKey, EOF, Colon, BracketLeft, Comma
 from peek.parser import ParserEvent, ParserEventType
@@ -16,15 +17,24 @@ from peek.parser import ParserEvent, ParserEventType
 _logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=None)
+def load_schema(schema_filepath) -> Schema:
+    """
+    Load the elasticsearch-specification schema. The result is memoized per process.
+    """
+    with open(schema_filepath, 'rb') as ins:
+        return Schema(json_loads(ins.read()))
+
+
 class ESApiCompleter(metaclass=ABCMeta):
     def complete_url_path(
         self, document: Document, complete_event: CompleteEvent, method: str, path_tokens: List[PeekToken]
-    ) -> List[Completion]:
+    ) -> Iterable[Completion]:
         return []
 
     def complete_query_param_name(
         self, document: Document, complete_event: CompleteEvent, method: str, path_tokens: List[PeekToken]
-    ) -> List[Completion]:
+    ) -> Iterable[Completion]:
         return []
 
     def complete_query_param_value(
@@ -61,8 +71,7 @@ class NoopESApiCompleter(ESApiCompleter):
 
 class SchemaESApiCompleter(ESApiCompleter):
     def __init__(self, schema_filepath):
-        with open(schema_filepath) as ins:
-            self._schema = Schema(json.load(ins))
+        self._schema = load_schema(schema_filepath)
 
     def complete_url_path(self, document, complete_event, method, path_tokens):
         cursor_token = path_tokens[-1]
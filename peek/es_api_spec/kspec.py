@@ -1,7 +1,10 @@
 import ast
+import functools
 import json
 import logging
-from typing import List, Dict
+import os
+import re
+from typing import List, Dict, Tuple
 
 from prompt_toolkit.completion import Completion, CompleteEvent
 from prompt_toolkit.document import Document
@@ -11,17 +14,28 @@ from peek.common import PeekToken
 from peek.es_api_spec.api_completer import ESApiCompleter
 from peek.es_api_spec.kspec_js import build_js_specs
 from peek.es_api_spec.kspec_json import load_json_specs
+from peek.es_api_spec.path_trie import (
+    PathEntry,
+    build_method_tries,
+    build_paths_by_method,
+    underscore_mask_of,
+)
 from peek.lexers import Slash, PathPart, Assign, CurlyLeft, CurlyRight, DictKey, Colon, BracketLeft, EOF, Comma
 from peek.parser import ParserEvent, ParserEventType
 
 _logger = logging.getLogger(__name__)
 
+# Default word pattern of prompt_toolkit's FuzzyCompleter
+_FUZZY_WORD_PATTERN = re.compile(r'^[a-zA-Z0-9_]*')
+
 
 class KibanaSpecESApiCompleter(ESApiCompleter):
     def __init__(self, app, kibana_dir):
         self.app = app
         self.kibana_dir = kibana_dir
         self.specs = self._build_specs()
+        self.paths_by_method = build_paths_by_method(self.specs)
+        self.method_tries = build_method_tries(self.paths_by_method)
 
     def complete_url_path(self, document: Document, complete_event: CompleteEvent, method, path_tokens):
         cursor_token = path_tokens[-1]
@@ -29,37 +43,38 @@ class KibanaSpecESApiCompleter(ESApiCompleter):
         token_stream = [t.value for t in path_tokens if t.ttype is not Slash]
         if cursor_token.ttype is PathPart:
             token_stream.pop()
-        candidates = []
-        for api_name, api_spec in self.specs.items():
-            if 'methods' not in api_spec:
-                continue
-            if method not in api_spec['methods']:
-                continue
-            for api_path in api_spec['patterns']:
-                ps = [p for p in api_path.split('/') if p]
-                # Nothing to complete if the candidate is shorter than current input
-                if len(token_stream) >= len(ps):
-                    continue
-                if not can_match(token_stream, ps):
-                    continue
-                candidate = '/'.join(ps[len(token_stream) :])
-                candidates.append(Completion(candidate))
-        return candidates
+        root = self.method_tries.get(method)
+        if root is None:
+            return
+        # Pre-filter with the same word that FuzzyCompleter matches candidates against
+        fuzzy_word = document.get_word_before_cursor(pattern=_FUZZY_WORD_PATTERN)
+        seen = set()
+        for node in root.descend(token_stream):
+            for candidate in node.suffixes(fuzzy_word):
+                if candidate not in seen:
+                    seen.add(candidate)
+                    yield Completion(candidate)
 
     def complete_query_param_name(self, document: Document, complete_event: CompleteEvent, method, path_tokens):
         _logger.debug(f'Completing URL query param name: {path_tokens[-1]}')
         token_stream = [t.value for t in path_tokens if t.ttype is PathPart]
-        candidates = set()
-        for api_spec in matchable_specs(method, token_stream, self.specs):
-            candidates.update(api_spec['url_params'].keys())
-        return [Completion(c) for c in candidates]
+        root = self.method_tries.get(method)
+        if root is None:
+            return
+        terminals = [node for node in root.descend(token_stream) if node.is_terminal]
+        if len(terminals) == 1:
+            candidates = terminals[0].params
+        else:
+            candidates = frozenset().union(*(node.params for node in terminals))
+        for c in candidates:
+            yield Completion(c)
 
     def complete_query_param_value(self, document: Document, complete_event: CompleteEvent, method, path_tokens):
         _logger.debug(f'Completing URL query param value: {path_tokens[-1]}')
         param_name_token = path_tokens[-2] if path_tokens[-1].ttype is Assign else path_tokens[-3]
         token_stream = [t.value for t in path_tokens if t.ttype is PathPart]
         candidates = set()
-        for api_spec in matchable_specs(method, token_stream, self.specs):
+        for api_spec in matchable_specs(method, token_stream, self.specs, paths_by_method=self.paths_by_method):
             v = api_spec['url_params'].get(param_name_token.value, None)
             if v is None:
                 continue
@@ -214,7 +229,15 @@ class KibanaSpecESApiCompleter(ESApiCompleter):
     def _find_rules_for_method_and_url_path(self, method: str, path_tokens: List[PeekToken]):
         token_stream = [t.value for t in path_tokens if t.ttype is PathPart]
         try:
-            api_spec = next(matchable_specs(method, token_stream, self.specs, required_field='data_autocomplete_rules'))
+            api_spec = next(
+                matchable_specs(
+                    method,
+                    token_stream,
+                    self.specs,
+                    required_field='data_autocomplete_rules',
+                    paths_by_method=self.paths_by_method,
+                )
+            )
             _logger.debug(f'Found API spec for {method!r} {path_tokens}')
         except StopIteration:
             _logger.debug(f'No matching API spec found for {method!r} {path_tokens}')
@@ -340,25 +363,38 @@ class KibanaSpecESApiCompleter(ESApiCompleter):
             return None
 
     def _build_specs(self):
-        specs = {}
-        if not self.app.batch_mode and self.app.config.as_bool('load_api_specs'):
-            _logger.info(f'Build API specs from: {self.kibana_dir}')
-            try:
-                specs.update(load_json_specs(self.kibana_dir))
-            except Exception:
-                _logger.exception('Error loading JSON specs')
-            specs = _merge_specs(specs, self._build_js_specs())
-        return specs
-
-    def _build_js_specs(self):
-        specs = {}
-        if self.app.config.as_bool('build_extended_api_specs'):
-            _logger.info(f'Build extended API specs from: {self.kibana_dir}')
-            try:
-                specs = build_js_specs(self.kibana_dir, self.app.config.as_bool('cache_extended_api_specs'))
-            except Exception:
-                _logger.exception('Error building JS specs')
-        return specs
+        if self.app.batch_mode or not self.app.config.as_bool('load_api_specs'):
+            return {}
+        loader = load_specs.__wrapped__ if os.environ.get('PEEK_NO_SPECS_CACHE') else load_specs
+        return loader(
+            self.kibana_dir,
+            self.app.config.as_bool('build_extended_api_specs'),
+            self.app.config.as_bool('cache_extended_api_specs'),
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def load_specs(kibana_dir, build_extended_api_specs, cache_extended_api_specs):
+    """
+    Load and merge the JSON and extended API specs from the given Kibana directory.
+    The result is memoized per process so that repeated completer instantiation does
+    not re-read and re-parse all spec files. Set the PEEK_NO_SPECS_CACHE environment
+    variable to bypass the memoization.
+    """
+    _logger.info(f'Build API specs from: {kibana_dir}')
+    specs = {}
+    try:
+        specs.update(load_json_specs(kibana_dir))
+    except Exception:
+        _logger.exception('Error loading JSON specs')
+    extended_specs = {}
+    if build_extended_api_specs:
+        _logger.info(f'Build extended API specs from: {kibana_dir}')
+        try:
+            extended_specs = build_js_specs(kibana_dir, cache_extended_api_specs)
+        except Exception:
+            _logger.exception('Error building JS specs')
+    return _merge_specs(specs, extended_specs)
 
 
 def _merge_specs(basic_specs, extended_specs):
@@ -377,40 +413,50 @@ def _merge_specs(basic_specs, extended_specs):
     return specs
 
 
-def matchable_specs(method: str, ts: List[str], specs: Dict, required_field='url_params') -> Dict:
+def matchable_specs(
+    method: str,
+    ts: List[str],
+    specs: Dict,
+    required_field='url_params',
+    paths_by_method: Dict[str, List[PathEntry]] = None,
+) -> Dict:
     """
     Find the matchable spec for the given HTTP method and input path.
+    The pre-split paths are built on the fly if they are not provided.
     """
-    for api_name, api_spec in specs.items():
-        if 'methods' not in api_spec:
+    if paths_by_method is None:
+        paths_by_method = build_paths_by_method(specs)
+    ts = tuple(ts)
+    underscore_mask = underscore_mask_of(ts)
+    seen_api_names = set()
+    for entry in paths_by_method.get(method, ()):
+        if entry.api_name in seen_api_names:
+            continue
+        if len(ts) != len(entry.segments):
             continue
-        if method not in api_spec['methods']:
+        if not can_match(ts, entry.segments, entry.brace_mask, underscore_mask):
             continue
+        seen_api_names.add(entry.api_name)
+        api_spec = specs[entry.api_name]
         if not api_spec.get(required_field, None):
             continue
-        matched = False
-        for pattern in api_spec['patterns']:
-            ps = [p for p in pattern.split('/') if p]
-            if len(ts) != len(ps):
-                continue
-            if not can_match(ts, ps):
-                continue
-            matched = True
-            break
-        if matched:
-            yield api_spec
+        yield api_spec
 
 
-def can_match(ts, ps):
+def can_match(ts: Tuple[str, ...], segs: Tuple[str, ...], brace_mask: int, underscore_mask: int = None) -> bool:
     """
-    Test whether the input path (ts) can match the candidate path (ps).
+    Test whether the input path (ts) can match the candidate path (segs).
     The rule is basically a placeholder can match any string other than
-    the ones leading with underscore.
+    the ones leading with underscore. Placeholders of the candidate path
+    are given by the set bits of brace_mask and underscore leading input
+    segments by the set bits of underscore_mask, which is computed from
+    ts if not provided.
     """
-    for t, p in zip(ts, ps):
-        if t != p:
-            if t.startswith('_'):
-                return False
-            if not (p.startswith('{') and p.endswith('}')):
-                return False
+    if underscore_mask is None:
+        underscore_mask = underscore_mask_of(ts)
+    # Bit i is set if a mismatch at position i is still allowed
+    wildcard_mask = brace_mask & ~underscore_mask
+    for i, (t, p) in enumerate(zip(ts, segs)):
+        if t != p and not (wildcard_mask >> i) & 1:
+            return False
     return True
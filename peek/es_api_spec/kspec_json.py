@@ -1,7 +1,8 @@
-import json
 import logging
 import os
 
+from peek.common import json_loads
+
 _logger = logging.getLogger(__name__)
 
 
@@ -23,11 +24,11 @@ def _do_load_json_specs(base_dir):
         if not os.path.exists(d):
             _logger.warning(f'JSON specs directory does not exist: {d}')
             continue
-        for f in os.listdir(d):
-            if f == '_common.json':
-                continue
-            with open(os.path.join(d, f)) as ins:
-                spec = json.load(ins)
+        with os.scandir(d) as it:
+            entries = [e for e in it if e.name.endswith('.json') and e.name != '_common.json' and e.is_file()]
+        for entry in entries:
+            with open(entry.path, 'rb') as ins:
+                spec = json_loads(ins.read())
             if sub_dir == 'generated':
                 specs.update(spec)
             else:
@@ -0,0 +1,159 @@
+import itertools
+import logging
+import sys
+from typing import Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Set, Tuple
+
+_logger = logging.getLogger(__name__)
+
+# Whether to intern path segments and param names of the specs, so that the many repeated
+# ones, e.g. _search, share a single string and compare by identity first
+_INTERN = True
+
+
+class PathEntry(NamedTuple):
+    """
+    A single URL path of an API, pre-split into segments at spec load time.
+    """
+
+    segments: Tuple[str, ...]
+    brace_mask: int
+    api_name: str
+    params: FrozenSet[str]
+
+
+class TrieNode:
+    """
+    A node of the URL path trie. Literal path segments and placeholder segments,
+    e.g. {index}, are kept separately so that placeholders can be matched against
+    any input segment without scanning the literal ones.
+    """
+
+    def __init__(self):
+        self.children: Dict[str, 'TrieNode'] = {}
+        self.param_children: Dict[str, 'TrieNode'] = {}
+        self.is_terminal = False
+        self.api_names: Set[str] = set()
+        self.params: FrozenSet[str] = frozenset()
+
+    def insert(self, segments: Iterable[str]) -> 'TrieNode':
+        node = self
+        for segment in segments:
+            children = node.param_children if is_placeholder(segment) else node.children
+            child = children.get(segment)
+            if child is None:
+                child = children[segment] = TrieNode()
+            node = child
+        return node
+
+    def descend(self, ts: List[str]) -> List['TrieNode']:
+        """
+        Find all nodes that can be reached by the input path (ts). The rule is basically
+        a placeholder can match any string other than the ones leading with underscore.
+        """
+        nodes = [self]
+        for t in ts:
+            is_underscore = t.startswith('_')
+            next_nodes = []
+            for node in nodes:
+                child = node.children.get(t)
+                if child is not None:
+                    next_nodes.append(child)
+                for p, child in node.param_children.items():
+                    if not is_underscore or t == p:
+                        next_nodes.append(child)
+            if not next_nodes:
+                return []
+            nodes = next_nodes
+        return nodes
+
+    def suffixes(self, fuzzy_word: str = '') -> Iterator[str]:
+        """
+        Generate the remaining paths, relative to this node, of all terminal nodes below it.
+        If fuzzy_word is given, only paths containing its chars in order (case-insensitive)
+        are generated. This is the same rule as FuzzyCompleter, but the matching progress
+        is carried along the traversal so that each segment is checked once for all paths
+        sharing it, and non-matching paths are never joined.
+        """
+        fuzzy_word = fuzzy_word.lower()
+        n_chars = len(fuzzy_word)
+        stack = [(self, (), 0)]
+        while stack:
+            node, prefix, n_matched = stack.pop()
+            for segment, child in itertools.chain(node.children.items(), node.param_children.items()):
+                path = prefix + (segment,)
+                child_n_matched = n_matched
+                if child_n_matched < n_chars:
+                    # Scan for the next unmatched char with str.find so the per-char loop runs in C
+                    text = (segment if not prefix else '/' + segment).lower()
+                    pos = 0
+                    while child_n_matched < n_chars:
+                        pos = text.find(fuzzy_word[child_n_matched], pos) + 1
+                        if pos == 0:
+                            break
+                        child_n_matched += 1
+                if child.is_terminal and child_n_matched == n_chars:
+                    yield '/'.join(path)
+                stack.append((child, path, child_n_matched))
+
+
+def is_placeholder(segment: str) -> bool:
+    return segment.startswith('{') and segment.endswith('}')
+
+
+def brace_mask_of(segments: Iterable[str]) -> int:
+    """
+    Pack the placeholder flags of the path segments into an int, bit i is set if segment i is a placeholder.
+    """
+    return sum(1 << i for i, p in enumerate(segments) if is_placeholder(p))
+
+
+def underscore_mask_of(segments: Iterable[str]) -> int:
+    """
+    Pack the underscore-leading flags of the input path segments into an int, bit i is set if segment i
+    starts with an underscore and hence cannot be matched by a placeholder.
+    """
+    return sum(1 << i for i, t in enumerate(segments) if t.startswith('_'))
+
+
+def split_path(path: str) -> List[str]:
+    return [p for p in path.split('/') if p]
+
+
+def build_paths_by_method(specs: Dict) -> Dict[str, List[PathEntry]]:
+    """
+    Split the URL paths of the Kibana API specs once and bucket them by HTTP method.
+    Entries of each method keep the order of the specs.
+    """
+    intern = sys.intern if _INTERN else str
+    # Identical segment tuples and param sets are shared between entries
+    shared = {}
+    paths_by_method: Dict[str, List[PathEntry]] = {}
+    for api_name, api_spec in specs.items():
+        if not isinstance(api_spec, dict) or 'methods' not in api_spec:
+            continue
+        url_params = api_spec.get('url_params', None)
+        params = frozenset(intern(p) for p in (url_params.keys() if isinstance(url_params, dict) else ()))
+        params = shared.setdefault(params, params)
+        for pattern in api_spec.get('patterns', ()):
+            segments = tuple(intern(p) for p in split_path(pattern))
+            segments = shared.setdefault(segments, segments)
+            entry = PathEntry(segments, brace_mask_of(segments), api_name, params)
+            for method in api_spec['methods']:
+                paths_by_method.setdefault(method, []).append(entry)
+    return paths_by_method
+
+
+def build_method_tries(paths_by_method: Dict[str, List[PathEntry]]) -> Dict[str, TrieNode]:
+    """
+    Build one path trie per HTTP method from the pre-split URL paths.
+    """
+    method_tries: Dict[str, TrieNode] = {}
+    for method, entries in paths_by_method.items():
+        root = method_tries[method] = TrieNode()
+        for entry in entries:
+            node = root.insert(entry.segments)
+            node.is_terminal = True
+            node.api_names.add(entry.api_name)
+            node.params |= entry.params
+    _logger.debug(f'Built path tries for methods: {sorted(method_tries.keys())}')
+    return method_tries
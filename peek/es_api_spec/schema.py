@@ -1,7 +1,7 @@
 import logging
 import numbers
 from dataclasses import dataclass
-from typing import List, Dict, Union, Any
+from typing import List, Dict, Union, Any, FrozenSet
 
 _logger = logging.getLogger(__name__)
 
@@ -343,6 +343,7 @@ class Schema:
                 continue
             self.types[type_definition.name] = type_definition
         self._common_parameters = self._build_common_params()
+        self._query_param_names: Dict[TypeName, FrozenSet[str]] = {}
 
     def candidate_urls(self, method: str, ts: List[str]) -> List[str]:
         candidates = []
@@ -365,12 +366,7 @@ class Schema:
         for endpoint in self._matchable_endpoints(method, ts):
             if endpoint.request is None:
                 continue
-            request: Request = self.types[endpoint.request]
-            if self._request_has_common_query_params(request):
-                candidates.update(self._common_parameters.keys())
-            query = request.get_query()
-            if query is not None:
-                candidates.update(query.keys())
+            candidates.update(self._query_param_names_for_request(endpoint.request))
 
         return sorted(candidates)
 
@@ -496,6 +492,23 @@ class Schema:
                 sub_properties.extend(self._sub_properties_for_property(self.types, matched_property))
             return sub_properties
 
+    def _query_param_names_for_request(self, request_name: TypeName) -> FrozenSet[str]:
+        """
+        Query param names of a request, including the common ones if applicable.
+        They are static for a request and hence computed once and memoized.
+        """
+        names = self._query_param_names.get(request_name, None)
+        if names is None:
+            request: Request = self.types[request_name]
+            names = set()
+            if self._request_has_common_query_params(request):
+                names.update(self._common_parameters.keys())
+            query = request.get_query()
+            if query is not None:
+                names.update(query.keys())
+            names = self._query_param_names[request_name] = frozenset(names)
+        return names
+
     def _build_common_params(self) -> Dict[str, List[str]]:
         type_definition = self.types[TypeName('CommonQueryParameters', '_spec_utils')]
         if not isinstance(type_definition, Interface):
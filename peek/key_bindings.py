@@ -11,7 +11,7 @@ from prompt_toolkit.key_binding.key_processor import KeyPressEvent
 from peek.common import HTTP_METHODS
 from peek.errors import PeekSyntaxError, PeekError
 from peek.lexers import (
-    PeekLexer,
+    PEEK_LEXER,
     TripleD,
     TripleS,
     ParenLeft,
@@ -232,21 +232,20 @@ def key_bindings(app):
 
 
 def buffer_should_be_handled(app):
-    peek_lexer = PeekLexer()
-
     @Condition
     def cond():
         document: Document = get_app().layout.get_buffer_by_name(DEFAULT_BUFFER).document
         _logger.debug(f'current document: {document}')
+        text = document.text
         # Always handle empty text
-        if document.text.strip() == '':
+        if _is_blank(text):
             return True
 
         if document.line_count == 1:
-            if document.text.strip().split(maxsplit=1)[0].lower() in (HTTP_METHODS + ['for']):
+            if text.split(maxsplit=1)[0].lower() in (HTTP_METHODS + ['for']):
                 return False
             else:
-                tokens = process_tokens(peek_lexer.get_tokens_unprocessed(document.text_before_cursor))
+                tokens = process_tokens(PEEK_LEXER.get_tokens_unprocessed(document.text_before_cursor))
                 if len(tokens) == 0:  # cursor is at the very beginning
                     return True
                 last_token = tokens[-1]
@@ -272,10 +271,14 @@ def buffer_should_be_handled(app):
                 else:
                     return True
         else:
-            if document.current_line.strip() == '' and document.text_after_cursor.strip() == '':
+            if _is_blank(document.current_line) and _is_blank(document.text_after_cursor):
                 _logger.debug('lines are empty at and after cursor')
                 return True
             else:
                 return False
 
     return cond
+
+
+def _is_blank(text: str) -> bool:
+    return not text or text.isspace()
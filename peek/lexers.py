@@ -398,3 +398,10 @@ class UrlPathLexer(RegexLexer):
     def get_tokens_unprocessed(self, text, stack=('root',)) -> PeekToken:
         for t in super().get_tokens_unprocessed(text, stack):
             yield PeekToken(*t)
+
+
+# Shared lexer instances. Lexers keep no state between calls of get_tokens_unprocessed,
+# so a single instance per configuration is reused instead of creating one per consumer.
+PEEK_LEXER = PeekLexer()
+PEEK_VALUE_LEXER = PeekLexer(stack=('value',))
+URL_PATH_LEXER = UrlPathLexer()
@@ -28,7 +28,7 @@ from peek.ast import (
 from peek.common import PeekToken, HTTP_METHODS
 from peek.errors import PeekSyntaxError
 from peek.lexers import (
-    PeekLexer,
+    PEEK_LEXER,
     BlankLine,
     CurlyLeft,
     DictKey,
@@ -114,7 +114,7 @@ class PeekParser:
     """
 
     def __init__(self, listeners=None):
-        self.lexer = PeekLexer()
+        self.lexer = PEEK_LEXER
         self.text = ''
         self.position = 0  # position is token position, not character
         self.tokens = []
@@ -472,11 +472,14 @@ def process_tokens(tokens: Iterable[PeekToken]):
     return processed_tokens
 
 
+_STMT_START_TTYPES = (HttpMethod, FuncName, ShellOut, Let, For)
+
+
 def find_last_stmt_token(tokens) -> int:
     """
     Find the last token that can start a statement
     """
     for i in range(len(tokens) - 1, -1, -1):
-        if tokens[i].ttype in (HttpMethod, FuncName, ShellOut, Let, For):
+        if tokens[i].ttype in _STMT_START_TTYPES:
             return i
     return -1
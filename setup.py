@@ -57,7 +57,7 @@ setup(
     name='es-peek',
     packages=find_packages(include=['peek', 'peek.*']),
     setup_requires=setup_requirements,
-    extras_require={'full': ['kerberos~=1.3.1', 'pyperclip~=1.8.2']},
+    extras_require={'full': ['kerberos~=1.3.1', 'pyperclip~=1.8.2', 'orjson>=3.6']},
     test_suite='tests',
     tests_require=test_requirements,
     url='https://github.com/ywangd/peek',
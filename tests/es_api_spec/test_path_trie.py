@@ -0,0 +1,115 @@
+from peek.es_api_spec.kspec import matchable_specs, can_match
+from peek.es_api_spec.path_trie import build_method_tries, build_paths_by_method, underscore_mask_of
+
+specs = {
+    'GLOBAL': {'query': {}},
+    'cat.indices': {
+        'url_params': {'format': '', 'v': '__flag__'},
+        'methods': ['GET'],
+        'patterns': ['_cat/indices', '_cat/indices/{index}'],
+    },
+    'cat.nodes': {
+        'url_params': {'h': [], 'full_id': '__flag__'},
+        'methods': ['GET'],
+        'patterns': ['_cat/nodes'],
+    },
+    'search': {
+        'url_params': {'q': '', 'size': ''},
+        'methods': ['GET', 'POST'],
+        'patterns': ['_search', '{indices}/_search'],
+    },
+    'index': {
+        'url_params': {'refresh': ['true', 'false', 'wait_for']},
+        'methods': ['PUT', 'POST'],
+        'patterns': ['{indices}/_doc/{id}'],
+    },
+}
+
+paths_by_method = build_paths_by_method(specs)
+method_tries = build_method_tries(paths_by_method)
+
+
+def test_build_method_tries():
+    assert set(method_tries.keys()) == {'GET', 'POST', 'PUT'}
+    assert set(method_tries['GET'].children.keys()) == {'_cat', '_search'}
+    assert set(method_tries['GET'].param_children.keys()) == {'{indices}'}
+
+
+def test_descend_and_suffixes():
+    root = method_tries['GET']
+    suffixes = set()
+    for node in root.descend(['_cat']):
+        suffixes.update(node.suffixes())
+    assert suffixes == {'indices', 'indices/{index}', 'nodes'}
+
+    suffixes = set()
+    for node in root.descend(['my-index']):
+        suffixes.update(node.suffixes())
+    assert suffixes == {'_search'}
+
+    # Placeholder does not match input leading with underscore
+    assert root.descend(['_cat', 'indices', '_foo']) == []
+    assert root.descend(['_unknown']) == []
+
+
+def test_params_of_terminal_nodes():
+    nodes = method_tries['GET'].descend(['_cat', 'indices'])
+    assert [n.params for n in nodes if n.is_terminal] == [{'format', 'v'}]
+
+    nodes = method_tries['POST'].descend(['my-index', '_doc', '1'])
+    assert [n.params for n in nodes if n.is_terminal] == [{'refresh'}]
+
+
+def test_build_paths_by_method():
+    assert [e.segments for e in paths_by_method['POST']] == [
+        ('_search',),
+        ('{indices}', '_search'),
+        ('{indices}', '_doc', '{id}'),
+    ]
+    assert paths_by_method['PUT'][0].brace_mask == 0b101
+
+
+def test_matchable_specs():
+    assert list(matchable_specs('GET', ['_cat', 'indices'], specs, paths_by_method=paths_by_method)) == [
+        specs['cat.indices']
+    ]
+    assert list(matchable_specs('POST', ['my-index', '_search'], specs, paths_by_method=paths_by_method)) == [
+        specs['search']
+    ]
+    assert list(matchable_specs('POST', ['_foo', '_search'], specs, paths_by_method=paths_by_method)) == []
+    # Index is built on the fly when not provided
+    assert list(matchable_specs('PUT', ['my-index', '_doc', '1'], specs)) == [specs['index']]
+
+
+def test_can_match():
+    assert can_match(('_cat', 'indices'), ('_cat', 'indices'), 0b00)
+    assert can_match(('my-index', '_doc'), ('{index}', '_doc'), 0b01)
+    assert not can_match(('_all', '_doc'), ('{index}', '_doc'), 0b01)
+    assert not can_match(('my-index', '_doc'), ('_cat', '_doc'), 0b00)
+    assert can_match(('my-index', '_doc'), ('{index}', '_doc'), 0b01, underscore_mask_of(('my-index', '_doc')))
+    assert not can_match(('_all', '_doc'), ('{index}', '_doc'), 0b01, underscore_mask_of(('_all', '_doc')))
+
+
+def test_underscore_mask_of():
+    assert underscore_mask_of(('_cat', 'indices', '_all')) == 0b101
+    assert underscore_mask_of(()) == 0
+
+
+def test_suffixes_with_fuzzy_word():
+    root = method_tries['GET']
+    assert set(root.suffixes('_c')) == {
+        '_cat/indices',
+        '_cat/indices/{index}',
+        '_cat/nodes',
+        '_search',
+        '{indices}/_search',
+    }
+    assert set(root.suffixes('ndx')) == {'_cat/indices/{index}'}
+    assert set(root.suffixes('NODES')) == {'_cat/nodes'}
+    assert set(root.suffixes('xyz')) == set()
+
+
+def test_path_segments_are_shared():
+    post_entries = paths_by_method['POST']
+    # The {indices} segment of '{indices}/_search' and '{indices}/_doc/{id}' is the same string
+    assert post_entries[1].segments[0] is post_entries[2].segments[0]
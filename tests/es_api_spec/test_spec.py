@@ -3,7 +3,7 @@ import os
 import pytest
 
 from peek import __file__ as package_root
-from peek.es_api_spec.kspec import matchable_specs
+from peek.es_api_spec.kspec import matchable_specs, load_specs
 from peek.es_api_spec.kspec_json import load_json_specs
 
 package_root = os.path.dirname(package_root)
@@ -20,3 +20,9 @@ def test_load_specs():
     next(matchable_specs('POST', ['_security', 'api_key'], specs))
 
     next(matchable_specs('POST', ['_security', 'oauth2', 'token'], specs, required_field='data_autocomplete_rules'))
+
+
+def test_load_specs_is_memoized(tmp_path):
+    specs = load_specs(str(tmp_path), False, False)
+    assert specs == {}
+    assert load_specs(str(tmp_path), False, False) is specs
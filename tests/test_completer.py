@@ -7,8 +7,9 @@ from prompt_toolkit.completion import CompleteEvent, Completion
 from prompt_toolkit.document import Document
 
 from peek import __file__ as package_root
-from peek.completer import PeekCompleter
+from peek.completer import PeekCompleter, ParserStateTracker
 from peek.natives import EXPORTS
+from peek.parser import PeekParser
 
 package_root = os.path.dirname(package_root)
 kibana_dir = os.path.join(package_root, 'specs', 'kibana-7.8.1')
@@ -874,3 +875,15 @@ def test_field_placeholder():
         Completion(text='fuzziness'),
         Completion(text='zero_terms_query'),
     )
+
+
+def test_parser_state_tracker_position_of_token():
+    text = '''GET _search
+{"query": {"match": {"a_field": ""'''
+    state_tracker = ParserStateTracker(text)
+    try:
+        PeekParser((state_tracker,)).parse(text, last_stmt_only=True)
+    except Exception:
+        pass
+    for i, token in enumerate(state_tracker.tokens):
+        assert state_tracker.position_of_token(token) == i
@@ -1,9 +1,16 @@
+import json
+import math
 from io import StringIO
-from unittest.mock import MagicMock, patch
+from json import JSONDecodeError
+from unittest.mock import ANY, MagicMock, patch
+
+import pytest
 
 from prompt_toolkit.formatted_text import PygmentsTokens, FormattedText
+from pygments.token import Token
 
-from peek.display import Display
+from peek.common import json_loads
+from peek.display import Display, merge_adjacent_tokens, all_to_text
 from peek.natives import EXPORTS
 
 mock_app = MagicMock(name='PeekApp')
@@ -41,17 +48,17 @@ def test_display_will_tokenize():
 
         display.info('"foo"')
         print_formatted_text.assert_called_with(
-            _PygmentsToken(), style=display.style, style_transformation=display.style_transformation
+            ANY, _PygmentsToken(), sep='\n', style=display.style, style_transformation=display.style_transformation
         )
 
         display.info('"foo" 42 "bar"')
         print_formatted_text.assert_called_with(
-            _PygmentsToken(), style=display.style, style_transformation=display.style_transformation
+            ANY, _PygmentsToken(), sep='\n', style=display.style, style_transformation=display.style_transformation
         )
 
         display.info({"foo": "bar"})
         print_formatted_text.assert_called_with(
-            _PygmentsToken(), style=display.style, style_transformation=display.style_transformation
+            ANY, _PygmentsToken(), sep='\n', style=display.style, style_transformation=display.style_transformation
         )
 
 
@@ -63,7 +70,11 @@ def test_display_will_print_plain_when_tokenize_is_impossible():
         mock_app.capture.file = MagicMock(return_value=capture_outs)
         display.info('[0]  http://localhost:9200')
         print_formatted_text.assert_called_with(
-            '[0]  http://localhost:9200', style=display.style, style_transformation=display.style_transformation
+            ANY,
+            '[0]  http://localhost:9200',
+            sep='\n',
+            style=display.style,
+            style_transformation=display.style_transformation,
         )
 
         capture_outs.seek(0)
@@ -78,8 +89,10 @@ def test_display_will_error():
         error = RuntimeError('This is an error')
         display.error(error)
         print_formatted_text.assert_called_with(
-            error, style=display.style, style_transformation=display.style_transformation
+            ANY, error, sep='\n', style=display.style, style_transformation=display.style_transformation
         )
+        print_formatted_text.assert_called_once()
+        assert all_to_text(print_formatted_text.call_args[0][0]) == '--- '
 
 
 def test_display_will_not_print_header_when_in_batch_mode():
@@ -104,12 +117,12 @@ def test_display_will_support_formatted_text():
         source_message = FormattedText()
         display.info(source_message)
         print_formatted_text.assert_called_with(
-            source_message, style=display.style, style_transformation=display.style_transformation
+            ANY, source_message, sep='\n', style=display.style, style_transformation=display.style_transformation
         )
         source_error = FormattedText()
         display.error(source_error)
         print_formatted_text.assert_called_with(
-            source_error, style=display.style, style_transformation=display.style_transformation
+            ANY, source_error, sep='\n', style=display.style, style_transformation=display.style_transformation
         )
 
 
@@ -122,3 +135,45 @@ class _PygmentsToken:
 
     def __repr__(self):
         return '_PygmentsToken'
+
+
+def test_merge_adjacent_tokens():
+    tokens = [
+        (Token.String, '"'),
+        (Token.String, 'foo'),
+        (Token.String, '"'),
+        (Token.Punctuation, ':'),
+        (Token.Number, '1'),
+    ]
+    assert list(merge_adjacent_tokens(tokens)) == [
+        (Token.String, '"foo"'),
+        (Token.Punctuation, ':'),
+        (Token.Number, '1'),
+    ]
+    assert list(merge_adjacent_tokens([])) == []
+
+
+def test_display_will_not_highlight_large_payload_when_not_pretty_print():
+    print_formatted_text = MagicMock()
+    with patch('peek.display.print_formatted_text', print_formatted_text), patch.dict(config, {'pretty_print': False}):
+        mock_app.batch_mode = False
+        mock_app.capture.file = MagicMock(return_value=None)
+        source = {'foo': 'x' * (1024 * 1024)}
+        display.info(source)
+        print_formatted_text.assert_called_with(
+            ANY, json.dumps(source), sep='\n', style=display.style, style_transformation=display.style_transformation
+        )
+
+        display.info({'foo': 'bar'})
+        print_formatted_text.assert_called_with(
+            ANY, _PygmentsToken(), sep='\n', style=display.style, style_transformation=display.style_transformation
+        )
+
+
+def test_json_loads_falls_back_for_documents_rejected_by_orjson():
+    assert json_loads('{"a": [1, 2.5, null]}') == {'a': [1, 2.5, None]}
+    assert json_loads(b'{"a": true}') == {'a': True}
+    assert json_loads(str(2**64)) == 2**64
+    assert math.isnan(json_loads('NaN'))
+    with pytest.raises(JSONDecodeError):
+        json_loads('{"a"')
@@ -1,3 +1,4 @@
+import copy
 import json
 import os
 from unittest.mock import MagicMock, patch, call
@@ -13,8 +14,8 @@ mock_history = MagicMock()
 MockHistory = MagicMock(return_value=mock_history)
 
 
-@pytest.fixture
-def peek_app():
+@pytest.fixture(scope='module')
+def module_peek_app():
     from peek import __file__ as package_root
 
     package_root = os.path.dirname(package_root)
@@ -37,6 +38,30 @@ def peek_app():
         return PeekApp(extra_config_options=('log_level=None', 'use_keyring=False'), cli_ns=MockCliNs())
 
 
+@pytest.fixture
+def peek_app(module_peek_app):
+    """
+    The app is built once per module. State changed by a test, i.e. replaced attributes,
+    VM variables and connections, is restored after it.
+    """
+    app_attrs = dict(vars(module_peek_app))
+    completer_attrs = dict(vars(module_peek_app.completer))
+    vm_context = dict(module_peek_app.vm.context)
+    es_client_manager = module_peek_app.es_client_manager
+    es_clients = [copy.copy(c) for c in es_client_manager.clients()]
+    index_current = es_client_manager.index_current
+    yield module_peek_app
+    vars(module_peek_app).clear()
+    vars(module_peek_app).update(app_attrs)
+    vars(module_peek_app.completer).clear()
+    vars(module_peek_app.completer).update(completer_attrs)
+    module_peek_app.vm.context.clear()
+    module_peek_app.vm.context.update(vm_context)
+    es_client_manager._clients[:] = es_clients
+    es_client_manager._index_current = index_current
+    mock_history.reset_mock()
+
+
 @patch.dict(os.environ, {'PEEK_PASSWORD': 'password'})
 def test_connection_related_funcs(peek_app):
     connect_f = ConnectFunc()